@@ -1,17 +1,13 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
 import io
+import math
 
 # ----------------------------
 # Custom CSS for Sailos branding
 # ----------------------------
-st.markdown("""
+CUSTOM_CSS = """
 <style>
 /* Sidebar header color and font */
 [data-testid="stSidebar"] h2, [data-testid="stSidebar"] h3 {
@@ -62,37 +58,143 @@ st.markdown("""
     border-left: 4px solid #1f77b4;
 }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Static dashboard and report text, built once at import
+QUICK_WINS_MD = """
+- 🪙 One-Time Boost
+- ✂️ Cut Expenses
+- 🔄 Round-Up Auto-Save
+- 📊 Peer Benchmark
+"""
+
+DEEP_OPTIMIZATION_MD = """
+- 📈 Rebalance Portfolio
+- 🧾 Tax Efficiency (Roth IRA/HSA)
+- 💳 Debt Strategy: Current debt {debt_amount}, min payment {min_payment}/month, APR {apr:.1f}%
+- 💸 Fee Scan
+"""
+
+PDF_QUICK_WINS = (
+    "- Add a one-time boost to reduce timeline",
+    "- Cut expenses and redirect to savings",
+    "- Enable micro-savings (round-ups)",
+    "- Track progress vs peers",
+)
 
 # ----------------------------
 # Helper Functions
 # ----------------------------
+def fmt_money(amount):
+    return f"${amount:,.2f}"
+
 def simulate_savings(starting_balance, monthly_contribution, annual_return, months):
-    balances = [starting_balance]
-    for _ in range(months):
-        new_balance = balances[-1] * (1 + annual_return / 12) + monthly_contribution
-        balances.append(new_balance)
-    return balances
+    # Closed form of b[k] = b[k-1] * r + c, with b[0] = starting_balance.
+    # A sequence of contributions yields one forecast row per contribution.
+    r = 1 + annual_return / 12
+    k = np.arange(months + 1, dtype=np.float64)
+    contribution = np.asarray(monthly_contribution, dtype=np.float64)[..., np.newaxis]
+    if r == 1:
+        return starting_balance + contribution * k
+    growth = r ** k
+    return starting_balance * growth + contribution * (growth - 1) / (r - 1)
 
 def simulate_debt_payoff(debt_amount, min_payment, extra_cash, debt_apr, months):
-    balances = []
-    debt_balance = debt_amount
-    for month in range(months):
-        if debt_balance > 0:
-            interest = debt_balance * debt_apr / 12
-            debt_balance = max(debt_balance + interest - (min_payment + extra_cash), 0)
-        balances.append(debt_balance)
-    return balances
-
-def generate_pdf_report(main_forecast, target_goal, debt_amount, min_debt_payment, debt_apr, extra_cash, months, monthly_contribution):
+    # Closed form of d[k] = d[k-1] * r - payment; once the balance reaches
+    # zero it stays there, so clipping the series reproduces the payoff
+    if debt_amount <= 0:
+        return np.full(months, float(debt_amount))
+    r = 1 + debt_apr / 12
+    payment = min_payment + extra_cash
+    k = np.arange(1, months + 1, dtype=np.float64)
+    if r == 1:
+        balances = debt_amount - payment * k
+    else:
+        growth = r ** k
+        balances = debt_amount * growth - payment * (growth - 1) / (r - 1)
+    return np.maximum(balances, 0)
+
+def months_to_debt_free(debt_amount, min_payment, extra_cash, debt_apr, months):
+    # Index of the first paid-off month in simulate_debt_payoff's output, or
+    # months if the debt is not cleared; solves d[k] <= 0 for k directly
+    if debt_amount <= 0:
+        return 0
+    r = 1 + debt_apr / 12
+    payment = min_payment + extra_cash
+    remaining = payment - debt_amount * (r - 1)
+    if payment <= 0 or remaining <= 0:
+        return months
+    if r == 1:
+        payoff = math.ceil(debt_amount / payment)
+    else:
+        payoff = math.ceil(math.log(payment / remaining) / math.log(r))
+    return min(payoff - 1, months)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def build_compare_fig(debt_forecast, invest_forecast, debt_free_month):
+    # float32 is plenty for plotting and halves the typed-array payload sent to
+    # the browser; metrics keep using the float64 forecasts
+    month_axis = np.arange(len(debt_forecast))
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=month_axis, y=debt_forecast.astype(np.float32),
+                             mode='lines', name='Debt Remaining', line=dict(color='red')))
+    fig.add_trace(go.Scatter(x=month_axis, y=invest_forecast[1:].astype(np.float32),
+                             mode='lines', name='Invest Extra', line=dict(color='green')))
+    fig.add_vline(x=debt_free_month, line_dash="dash", line_color="blue",
+                  annotation_text="Debt-Free", annotation_position="top right")
+    fig.update_layout(title="Debt vs Invest Comparison",
+                      xaxis_title="Month",
+                      yaxis_title="Amount ($)",
+                      template="plotly_white")
+    return fig
+
+def months_to_goal(starting_balance, monthly_contribution, annual_return, target_goal, max_months=600):
+    # Smallest n with starting_balance * r**n + c * (r**n - 1) / (r - 1) >= target_goal
+    if starting_balance >= target_goal:
+        return 0
+    r = 1 + annual_return / 12
+    if r == 1:
+        if monthly_contribution <= 0:
+            return max_months
+        n = (target_goal - starting_balance) / monthly_contribution
+    else:
+        steady = monthly_contribution / (r - 1)
+        if r <= 0 or starting_balance + steady == 0:
+            return max_months
+        ratio = (target_goal + steady) / (starting_balance + steady)
+        if ratio <= 0:
+            return max_months
+        n = math.log(ratio) / math.log(r)
+        if n <= 0:
+            return max_months
+    return min(math.ceil(n), max_months)
+
+@st.cache_resource
+def _logo_bytes():
+    # Read once per process and shared by the page and the PDF report
+    with open("logo.png", "rb") as f:
+        return f.read()
+
+@st.cache_resource
+def _pdf_styles():
+    # Shared across sessions; treat as read-only
+    from reportlab.lib.styles import getSampleStyleSheet
+    return getSampleStyleSheet()
+
+# PDFs are comparatively large; keep only a few recent reports around
+@st.cache_data(show_spinner=False, max_entries=8, ttl=600)
+def generate_pdf_report(main_forecast, target_goal, debt_amount, min_debt_payment, debt_apr, extra_cash, debt_free_month, debt_interest):
+    # ReportLab is only needed once a report is requested
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image
+
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer)
-    styles = getSampleStyleSheet()
+    styles = _pdf_styles()
     story = []
 
     # Add logo
-    logo = "logo.png"
-    im = Image(logo, width=100, height=100)
+    im = Image(io.BytesIO(_logo_bytes()), width=100, height=100)
     story.append(im)
     story.append(Spacer(1, 12))
 
@@ -107,35 +209,32 @@ def generate_pdf_report(main_forecast, target_goal, debt_amount, min_debt_paymen
     debt_to_asset_ratio = debt_amount / final_balance if final_balance > 0 else 0
 
     story.append(Paragraph("🎯 Personalized Recommendation", styles["Heading2"]))
-    story.append(Paragraph(f"Projected Balance: ${final_balance:,.2f}", styles["Normal"]))
-    story.append(Paragraph(f"Target Goal: ${target_goal:,.2f}", styles["Normal"]))
+    story.append(Paragraph(f"Projected Balance: {fmt_money(final_balance)}", styles["Normal"]))
+    story.append(Paragraph(f"Target Goal: {fmt_money(target_goal)}", styles["Normal"]))
     story.append(Paragraph(f"Goal Achievement: {progress*100:.1f}%", styles["Normal"]))
-    story.append(Paragraph(f"Deficit/Surplus: ${deficit_or_surplus:,.2f}", styles["Normal"]))
+    story.append(Paragraph(f"Deficit/Surplus: {fmt_money(deficit_or_surplus)}", styles["Normal"]))
     story.append(Paragraph(f"Debt-to-Asset Ratio: {debt_to_asset_ratio*100:.1f}%", styles["Normal"]))
     story.append(Spacer(1, 12))
 
     # Debt Metrics
-    debt_forecast = simulate_debt_payoff(debt_amount, min_debt_payment, extra_cash, debt_apr, months)
-    debt_free_month = next((i for i, v in enumerate(debt_forecast) if v <= 0), months)
-    total_interest = sum([debt_forecast[i] * debt_apr / 12 for i in range(debt_free_month)])
     story.append(Paragraph("💳 Debt Metrics & Payoff Simulation", styles["Heading2"]))
     story.append(Paragraph(f"Estimated months to debt-free: {debt_free_month}", styles["Normal"]))
-    story.append(Paragraph(f"Estimated interest paid: ${total_interest:,.2f}", styles["Normal"]))
+    story.append(Paragraph(f"Estimated interest paid: {fmt_money(debt_interest)}", styles["Normal"]))
     story.append(Spacer(1, 12))
 
     # Quick Wins & Deep Optimization
     story.append(Paragraph("⚡ Quick Wins", styles["Heading2"]))
-    story.append(Paragraph("- Add a one-time boost to reduce timeline", styles["Normal"]))
-    story.append(Paragraph("- Cut expenses and redirect to savings", styles["Normal"]))
-    story.append(Paragraph("- Enable micro-savings (round-ups)", styles["Normal"]))
-    story.append(Paragraph("- Track progress vs peers", styles["Normal"]))
+    story.extend([Paragraph(line, styles["Normal"]) for line in PDF_QUICK_WINS])
     story.append(Spacer(1, 12))
 
+    deep_optimization = [
+        "- Rebalance portfolio (10–15% to growth assets)",
+        "- Use Roth IRA/HSA for tax efficiency",
+        f"- Debt Strategy: Current debt {fmt_money(debt_amount)}, min payment {fmt_money(min_debt_payment)}/month, APR {debt_apr*100:.1f}%",
+        "- Review fund expense ratios for better returns",
+    ]
     story.append(Paragraph("🧠 Deep Optimization", styles["Heading2"]))
-    story.append(Paragraph("- Rebalance portfolio (10–15% to growth assets)", styles["Normal"]))
-    story.append(Paragraph("- Use Roth IRA/HSA for tax efficiency", styles["Normal"]))
-    story.append(Paragraph(f"- Debt Strategy: Current debt ${debt_amount:,.2f}, min payment ${min_debt_payment:,.2f}/month, APR {debt_apr*100:.1f}%", styles["Normal"]))
-    story.append(Paragraph("- Review fund expense ratios for better returns", styles["Normal"]))
+    story.extend([Paragraph(line, styles["Normal"]) for line in deep_optimization])
     story.append(Spacer(1, 12))
 
     # What-If Scenario
@@ -143,140 +242,122 @@ def generate_pdf_report(main_forecast, target_goal, debt_amount, min_debt_paymen
     story.append(Paragraph(f"Extra ${extra_cash}/month could improve goal achievement.", styles["Normal"]))
 
     doc.build(story)
-    buffer.seek(0)
-    return buffer
+    return buffer.getvalue()
 
-# ----------------------------
-# Streamlit App Layout
-# ----------------------------
-st.set_page_config(page_title="💰 Sailos", layout="wide")
-
-# Sidebar with logo
-st.sidebar.image("logo.png", width=120)
-st.sidebar.header("Your Inputs")
-starting_balance = st.sidebar.number_input("Starting Balance ($)", value=5000, step=500)
-monthly_contribution = st.sidebar.number_input("Monthly Contribution ($)", value=500, step=50)
-annual_return = st.sidebar.number_input("Expected Annual Return (%)", value=5.0, step=0.5)/100
-months = st.sidebar.number_input("Investment Horizon (Months)", value=120, step=12)
-target_goal = st.sidebar.number_input("Target Goal ($)", value=50000, step=1000)
-
-st.sidebar.subheader("Debt Information")
-debt_amount = st.sidebar.number_input("Debt Balance ($)", value=10000, step=500)
-debt_apr = st.sidebar.number_input("Debt APR (%)", value=18.0, step=0.5)/100
-min_debt_payment = st.sidebar.number_input("Minimum Monthly Debt Payment ($)", value=200, step=50)
-extra_cash = st.sidebar.number_input("Extra Cash Available ($/month)", value=100, step=50)
-
-# Main logo + title
-col1, col2 = st.columns([1,5])
-with col1:
-    st.image("logo.png", width=100)
-with col2:
-    st.markdown("<h1>💰 Sailos </h1>", unsafe_allow_html=True)
-    st.markdown("Plan, optimize, and accelerate your savings goals with debt & investment insights.")
-
-# Tabs
-tab1, tab2 = st.tabs(["💡 Dashboard", "🎯 Personalized Recommendation"])
+@st.fragment
+def pdf_report_section(main_forecast, target_goal, debt_amount, min_debt_payment, debt_apr, extra_cash, debt_free_month, debt_interest):
+    # Runs as a fragment so clicking the report buttons only reruns this block
+    if st.button("📄 Download PDF Report"):
+        pdf_bytes = generate_pdf_report(main_forecast, target_goal, debt_amount, min_debt_payment, debt_apr, extra_cash, debt_free_month, debt_interest)
+        # Downloading serves the prebuilt bytes without triggering another rerun
+        st.download_button("Download Sailos Report", data=pdf_bytes, file_name="Sailos_Report.pdf", mime="application/pdf", on_click="ignore")
 
 # ----------------------------
-# Tab 1: Dashboard
+# Streamlit App Layout
 # ----------------------------
-with tab1:
-    st.header("📊 Sailos Dashboard")
-    main_forecast = simulate_savings(starting_balance, monthly_contribution, annual_return, months)
+def main():
+    st.set_page_config(page_title="💰 Sailos", layout="wide")
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+    # Sidebar with logo
+    st.sidebar.image(_logo_bytes(), width=120)
+    st.sidebar.header("Your Inputs")
+    # Inputs live in a form so edits are applied in a single rerun on submit
+    with st.sidebar.form("inputs_form"):
+        starting_balance = st.number_input("Starting Balance ($)", value=5000, step=500)
+        monthly_contribution = st.number_input("Monthly Contribution ($)", value=500, step=50)
+        annual_return = st.number_input("Expected Annual Return (%)", value=5.0, step=0.5)/100
+        months = st.number_input("Investment Horizon (Months)", min_value=1, value=120, step=12)
+        target_goal = st.number_input("Target Goal ($)", min_value=1, value=50000, step=1000)
+
+        st.subheader("Debt Information")
+        debt_amount = st.number_input("Debt Balance ($)", value=10000, step=500)
+        debt_apr = st.number_input("Debt APR (%)", value=18.0, step=0.5)/100
+        min_debt_payment = st.number_input("Minimum Monthly Debt Payment ($)", value=200, step=50)
+        extra_cash = st.number_input("Extra Cash Available ($/month)", value=100, step=50)
+
+        st.form_submit_button("Update forecast")
+
+    # Keep the savings forecast in session state; only recompute when inputs change
+    forecast_inputs = (starting_balance, monthly_contribution, annual_return, months, target_goal, extra_cash)
+    if st.session_state.get("forecast_inputs") != forecast_inputs:
+        st.session_state.forecast_inputs = forecast_inputs
+        # Base and extra-cash forecasts share one vectorized computation
+        st.session_state.main_forecast, st.session_state.invest_forecast = simulate_savings(
+            starting_balance, (monthly_contribution, monthly_contribution + extra_cash), annual_return, months)
+        st.session_state.progress = st.session_state.main_forecast[-1] / target_goal
+    main_forecast = st.session_state.main_forecast
+    invest_forecast = st.session_state.invest_forecast
     debt_forecast = simulate_debt_payoff(debt_amount, min_debt_payment, extra_cash, debt_apr, months)
-    invest_forecast = simulate_savings(starting_balance, monthly_contribution + extra_cash, annual_return, months)
-
-    df_compare = pd.DataFrame({
-        "Month": range(months),
-        "Debt Remaining": debt_forecast,
-        "Invest Extra": invest_forecast[1:]
-    })
-
-    debt_free_month = next((i for i, v in enumerate(debt_forecast) if v <= 0), months)
-
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=df_compare["Month"], y=df_compare["Debt Remaining"],
-                             mode='lines', name='Debt Remaining', line=dict(color='red')))
-    fig.add_trace(go.Scatter(x=df_compare["Month"], y=df_compare["Invest Extra"],
-                             mode='lines', name='Invest Extra', line=dict(color='green')))
-    fig.add_vline(x=debt_free_month, line_dash="dash", line_color="blue",
-                  annotation_text="Debt-Free", annotation_position="top right")
-    fig.update_layout(title="Debt vs Invest Comparison",
-                      xaxis_title="Month",
-                      yaxis_title="Amount ($)",
-                      template="plotly_white")
-    st.plotly_chart(fig, use_container_width=True)
-
-    st.subheader("⚡ Quick Wins")
-    st.markdown("""
-    - 🪙 One-Time Boost
-    - ✂️ Cut Expenses
-    - 🔄 Round-Up Auto-Save
-    - 📊 Peer Benchmark
-    """)
-
-    st.subheader("🧠 Deep Optimization")
-    st.markdown(f"""
-    - 📈 Rebalance Portfolio
-    - 🧾 Tax Efficiency (Roth IRA/HSA)
-    - 💳 Debt Strategy: Current debt ${debt_amount:,.2f}, min payment ${min_debt_payment:,.2f}/month, APR {debt_apr*100:.1f}%
-    - 💸 Fee Scan
-    """)
-
-    months_to_payoff = debt_free_month
-    total_interest = sum([debt_forecast[i] * debt_apr / 12 for i in range(months_to_payoff)])
-    st.subheader("💳 Debt Metrics & Payoff Simulation")
-    st.markdown(f"""
-    - Estimated months to debt-free: **{months_to_payoff} months**
-    - Estimated interest paid: **${total_interest:,.2f}**
-    """)
-
-# ----------------------------
-# Tab 2: Personalized Recommendation
-# ----------------------------
-with tab2:
-    st.header("🎯 Sailos AI Navigator")
-    final_balance = main_forecast[-1]
-    total_contributions = monthly_contribution * months + starting_balance
-    total_interest = final_balance - total_contributions
-    progress = final_balance / target_goal
-    deficit_or_surplus = final_balance - target_goal
-    debt_to_asset_ratio = debt_amount / final_balance if final_balance > 0 else 0
-
-    month_counter = 0
-    balance_sim = starting_balance
-    while balance_sim < target_goal and month_counter < 600:
-        balance_sim = balance_sim * (1 + annual_return / 12) + monthly_contribution
-        month_counter += 1
-    months_to_goal_current = month_counter
-
-    month_counter_extra = 0
-    balance_sim_extra = starting_balance
-    while balance_sim_extra < target_goal and month_counter_extra < 600:
-        balance_sim_extra = balance_sim_extra * (1 + annual_return / 12) + monthly_contribution + extra_cash
-        month_counter_extra += 1
-    months_to_goal_extra = month_counter_extra
-
-    col1, col2, col3, col4, col5 = st.columns(5)
-    col1.metric("Projected Balance", f"${final_balance:,.2f}")
-    col2.metric("Goal Progress", f"{progress*100:.1f}%")
-    col3.metric("Deficit/Surplus", f"${deficit_or_surplus:,.2f}")
-    col4.metric("Debt-to-Asset Ratio", f"{debt_to_asset_ratio*100:.1f}%")
-    col5.metric("Months to Goal", f"{months_to_goal_current} (current)")
-
-    st.subheader("🔮 What-If: Extra Contributions")
-    st.info(f"Adding extra ${extra_cash}/month could reach your goal in **{months_to_goal_extra} months** instead of {months_to_goal_current} months.")
-
-    st.subheader("💹 Contributions vs Interest")
-    df_analytics = pd.DataFrame({
-        "Type": ["Contributions", "Interest Earned"],
-        "Amount": [total_contributions, total_interest]
-    })
-    fig_analytics = px.bar(df_analytics, x="Type", y="Amount", text="Amount",
-                           color="Type", color_discrete_map={"Contributions":"blue", "Interest Earned":"green"})
-    st.plotly_chart(fig_analytics, use_container_width=True)
-
-    if st.button("📄 Download PDF Report"):
-        pdf_buffer = generate_pdf_report(main_forecast, target_goal, debt_amount, min_debt_payment, debt_apr, extra_cash, months, monthly_contribution)
-        st.download_button("Download Sailos Report", data=pdf_buffer, file_name="Sailos_Report.pdf", mime="application/pdf")
-
+    debt_free_month = months_to_debt_free(debt_amount, min_debt_payment, extra_cash, debt_apr, months)
+    debt_interest = debt_forecast[:debt_free_month].sum() * debt_apr / 12
+
+    # Main logo + title
+    col1, col2 = st.columns([1,5])
+    with col1:
+        st.image(_logo_bytes(), width=100)
+    with col2:
+        st.markdown("<h1>💰 Sailos </h1>", unsafe_allow_html=True)
+        st.markdown("Plan, optimize, and accelerate your savings goals with debt & investment insights.")
+
+    # Tabs
+    tab1, tab2 = st.tabs(["💡 Dashboard", "🎯 Personalized Recommendation"])
+
+    # ----------------------------
+    # Tab 1: Dashboard
+    # ----------------------------
+    with tab1:
+        st.header("📊 Sailos Dashboard")
+        fig = build_compare_fig(debt_forecast, invest_forecast, debt_free_month)
+        st.plotly_chart(fig, use_container_width=True)
+
+        st.subheader("⚡ Quick Wins")
+        st.markdown(QUICK_WINS_MD)
+
+        st.subheader("🧠 Deep Optimization")
+        st.markdown(DEEP_OPTIMIZATION_MD.format(debt_amount=fmt_money(debt_amount), min_payment=fmt_money(min_debt_payment), apr=debt_apr*100))
+
+        st.subheader("💳 Debt Metrics & Payoff Simulation")
+        st.markdown(f"""
+        - Estimated months to debt-free: **{debt_free_month} months**
+        - Estimated interest paid: **{fmt_money(debt_interest)}**
+        """)
+
+    # ----------------------------
+    # Tab 2: Personalized Recommendation
+    # ----------------------------
+    with tab2:
+        st.header("🎯 Sailos AI Navigator")
+        final_balance = main_forecast[-1]
+        total_contributions = monthly_contribution * months + starting_balance
+        total_interest = final_balance - total_contributions
+        progress = st.session_state.progress
+        deficit_or_surplus = final_balance - target_goal
+        debt_to_asset_ratio = debt_amount / final_balance if final_balance > 0 else 0
+
+        months_to_goal_current = months_to_goal(starting_balance, monthly_contribution, annual_return, target_goal)
+        months_to_goal_extra = months_to_goal(starting_balance, monthly_contribution + extra_cash, annual_return, target_goal)
+
+        col1, col2, col3, col4, col5 = st.columns(5)
+        col1.metric("Projected Balance", fmt_money(final_balance))
+        col2.metric("Goal Progress", f"{progress*100:.1f}%")
+        col3.metric("Deficit/Surplus", fmt_money(deficit_or_surplus))
+        col4.metric("Debt-to-Asset Ratio", f"{debt_to_asset_ratio*100:.1f}%")
+        col5.metric("Months to Goal", f"{months_to_goal_current} (current)")
+
+        st.subheader("🔮 What-If: Extra Contributions")
+        st.info(f"Adding extra ${extra_cash}/month could reach your goal in **{months_to_goal_extra} months** instead of {months_to_goal_current} months.")
+
+        st.subheader("💹 Contributions vs Interest")
+        fig_analytics = go.Figure(go.Bar(x=["Contributions", "Interest Earned"],
+                                         y=[total_contributions, total_interest],
+                                         text=[f"${total_contributions:,.0f}", f"${total_interest:,.0f}"],
+                                         marker_color=["blue", "green"]))
+        fig_analytics.update_layout(xaxis_title="Type", yaxis_title="Amount")
+        st.plotly_chart(fig_analytics, use_container_width=True)
+
+        pdf_report_section(main_forecast, target_goal, debt_amount, min_debt_payment, debt_apr, extra_cash, debt_free_month, debt_interest)
+
+
+if __name__ == "__main__":
+    main()